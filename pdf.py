@@ -1,29 +1,49 @@
 #!/usr/bin/env python3
 
+from __future__ import annotations
+
 import argparse
-import glob
+import hashlib
 import os
 import sys
-from dataclasses import dataclass, asdict
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, asdict, replace
 from datetime import datetime
+from functools import cached_property
 from io import BytesIO
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple
 
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.units import mm
-    from reportlab.pdfgen import canvas
-    from reportlab.lib.utils import ImageReader
+if TYPE_CHECKING:
     from PIL import Image
-    import yaml
-except ImportError as e:
-    print(f"Missing dependency: {e}")
-    print("Install: pip install reportlab Pillow PyYAML")
-    sys.exit(1)
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
+MAX_RASTER_DPI = 600
+PT_PER_MM = 72 / 25.4
 
 
-@dataclass
+def check_dependencies():
+    # Image and PDF libraries are imported in the functions that use them, so --help and usage
+    # errors stay fast; this only turns a missing one into an install hint before any work starts
+    try:
+        import reportlab, PIL, numpy, yaml
+    except ImportError as e:
+        print(f"Missing dependency: {e}")
+        print("Install: pip install reportlab pillow-simd PyYAML numpy")
+        sys.exit(1)
+
+
+def vips_available() -> bool:
+    try:
+        import pyvips
+    except (ImportError, OSError):
+        return False
+    return True
+
+
+@dataclass(frozen=True)
 class Config:
     card_width_mm: float = 63.0
     card_height_mm: float = 88.0
@@ -38,150 +58,212 @@ class Config:
     
     @classmethod
     def from_yaml(cls, yaml_path: str):
+        import yaml
         if os.path.exists(yaml_path):
             with open(yaml_path) as f:
                 data = yaml.safe_load(f)
                 return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
         return cls()
+    
+    # Derived raster sizes, shared by every card of a run
+    @cached_property
+    def raster_dpi(self) -> int:
+        # Printers don't resolve beyond this, so higher spec DPIs only cost memory and encode time
+        return min(self.dpi, MAX_RASTER_DPI)
+    
+    @cached_property
+    def card_w_px(self) -> int:
+        return int(self.card_width_mm * self.raster_dpi / 25.4)
+    
+    @cached_property
+    def card_h_px(self) -> int:
+        return int(self.card_height_mm * self.raster_dpi / 25.4)
+    
+    @cached_property
+    def bleed_px(self) -> int:
+        return int(self.bleed_mm * self.raster_dpi / 25.4)
+
+
+def load_card_pil(path: str, card_w: int, card_h: int) -> Image.Image:
+    from PIL import Image
+    with Image.open(path) as img:
+        # JPEGs decode straight at the smallest DCT scale still covering the card; a no-op for PNG
+        img.draft('RGB', (card_w, card_h))
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        return img.resize((card_w, card_h), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+
+def load_card_vips(path: str, card_w: int, card_h: int) -> Image.Image:
+    import numpy as np
+    import pyvips
+    from PIL import Image
+    src = pyvips.Image.new_from_file(path, access='sequential')
+    if src.hasalpha():
+        # thumbnail() always resamples premultiplied, which blackens transparent pixels; drop alpha
+        # first instead, as PIL's convert('RGB') does
+        src = src.extract_band(0, n=src.bands - 1)
+        img = src.resize(card_w / src.width, vscale=card_h / src.height, kernel='lanczos3')
+    else:
+        # thumbnail() shrinks on load and streams the source instead of decoding it whole; EXIF
+        # orientation is left alone to match the PIL path
+        img = pyvips.Image.thumbnail(path, card_w, height=card_h, size='force', no_rotate=True)
+    if img.interpretation != 'srgb':
+        img = img.colourspace('srgb')
+    if img.bands > 3:
+        img = img.extract_band(0, n=3)
+    arr = np.ndarray(buffer=img.write_to_memory(), dtype=np.uint8, shape=(img.height, img.width, 3))
+    return Image.fromarray(arr)
+
+
+def render_card(path: str, config: Config, backend: str = 'pil') -> Optional[Tuple[bytes, bytes]]:
+    import numpy as np
+    from PIL import Image
+    bleed_px = config.bleed_px
+    
+    try:
+        load_card = load_card_vips if backend == 'vips' else load_card_pil
+        card_img = load_card(path, config.card_w_px, config.card_h_px)
+        if bleed_px > 0:
+            arr = np.asarray(card_img)
+            padded = np.pad(arr, ((bleed_px, bleed_px), (bleed_px, bleed_px), (0, 0)), mode='symmetric')
+            bleed_img = Image.fromarray(padded)
+        else:
+            bleed_img = card_img
+        
+        # ImageReader isn't picklable, so workers hand back encoded bytes
+        bleed_buf, card_buf = BytesIO(), BytesIO()
+        bleed_img.save(bleed_buf, 'JPEG', quality=90)
+        card_img.save(card_buf, 'JPEG', quality=90)
+        return bleed_buf.getvalue(), card_buf.getvalue()
+    except Exception:
+        return None
 
 
 class CardPuncher:
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, executor: Optional[Executor] = None, backend: str = 'pil'):
+        from reportlab.lib.pagesizes import A4
         self.config = config
+        self.executor = executor
+        self.backend = backend
         self.page_width, self.page_height = A4
         self.cache: Dict[str, Tuple[ImageReader, ImageReader]] = {}
+        self.pending: Dict[str, Future] = {}
+        self.queued: Deque[str] = deque()
+        self.lookahead = 0
+        self.fronts: List[str] = []
+        self.has_cardback = False
+        self.failed: List[str] = []
     
-    def mm_to_pt(self, mm_val: float) -> float:
-        return mm_val * mm
-        
     def find_images(self, folder: str) -> List[str]:
-        patterns = ['*.png', '*.jpg', '*.jpeg']
-        files = []
-        for pattern in patterns:
-            files.extend(glob.glob(os.path.join(folder, pattern)))
-            files.extend(glob.glob(os.path.join(folder, pattern.upper())))
-        return sorted(set(files))
-    
-    def create_mirrored_bleed(self, img: Image.Image) -> Image.Image:
-        c = self.config
-        card_w = int(c.card_width_mm * c.dpi / 25.4)
-        card_h = int(c.card_height_mm * c.dpi / 25.4)
-        bleed_px = int(c.bleed_mm * c.dpi / 25.4)
-        
-        card_img = img.resize((card_w, card_h), Image.Resampling.LANCZOS)
-        bleed_img = Image.new('RGB', (card_w + 2 * bleed_px, card_h + 2 * bleed_px))
-        bleed_img.paste(card_img, (bleed_px, bleed_px))
-        
-        edges = [
-            (card_img.crop((0, 0, bleed_px, card_h)).transpose(Image.FLIP_LEFT_RIGHT), (0, bleed_px)),
-            (card_img.crop((card_w - bleed_px, 0, card_w, card_h)).transpose(Image.FLIP_LEFT_RIGHT), (bleed_px + card_w, bleed_px)),
-            (card_img.crop((0, 0, card_w, bleed_px)).transpose(Image.FLIP_TOP_BOTTOM), (bleed_px, 0)),
-            (card_img.crop((0, card_h - bleed_px, card_w, card_h)).transpose(Image.FLIP_TOP_BOTTOM), (bleed_px, bleed_px + card_h)),
-        ]
-        
-        corners = [
-            (0, 0, 0, 0), (card_w - bleed_px, 0, bleed_px + card_w, 0),
-            (0, card_h - bleed_px, 0, bleed_px + card_h), (card_w - bleed_px, card_h - bleed_px, bleed_px + card_w, bleed_px + card_h)
-        ]
-        
-        for edge, pos in edges:
-            bleed_img.paste(edge, pos)
-        
-        for x1, y1, x2, y2 in corners:
-            corner = card_img.crop((x1, y1, x1 + bleed_px, y1 + bleed_px))
-            corner = corner.transpose(Image.FLIP_LEFT_RIGHT).transpose(Image.FLIP_TOP_BOTTOM)
-            bleed_img.paste(corner, (x2, y2))
-        
-        return bleed_img
+        exts = {'.png', '.jpg', '.jpeg'}
+        with os.scandir(folder) as entries:
+            files = [e.path for e in entries
+                     if e.is_file() and not e.name.startswith('.')
+                     and os.path.splitext(e.name)[1].lower() in exts]
+        return sorted(files)
     
-    def process_image(self, path: str) -> Optional[Tuple[ImageReader, ImageReader]]:
+    def process_image(self, path: str, cache: bool = True) -> Optional[Tuple[ImageReader, ImageReader]]:
         if path in self.cache:
             return self.cache[path]
         
-        try:
-            with Image.open(path) as img:
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                c = self.config
-                card_w = int(c.card_width_mm * c.dpi / 25.4)
-                card_h = int(c.card_height_mm * c.dpi / 25.4)
-                
-                card_img = img.resize((card_w, card_h), Image.Resampling.LANCZOS)
-                bleed_img = self.create_mirrored_bleed(img)
-                
-                result = (ImageReader(bleed_img), ImageReader(card_img))
-                self.cache[path] = result
-                return result
-        except Exception:
+        future = self.pending.pop(path, None)
+        if future:
+            self._submit_queued()
+        data = future.result() if future else render_card(path, self.config, self.backend)
+        result = self._wrap_rendered(data)
+        if cache:
+            self.cache[path] = result
+        return result
+    
+    def prerender(self, paths: List[str], lookahead: int):
+        # At most `lookahead` cards are rendered ahead of the draw loop; each one taken off
+        # pending lets the next queued path in, so finished rasters don't pile up in memory
+        self.lookahead = lookahead
+        self.queued.extend(p for p in paths if p not in self.cache and p not in self.pending)
+        self._submit_queued()
+    
+    def _submit_queued(self):
+        while self.queued and len(self.pending) < self.lookahead:
+            path = self.queued.popleft()
+            self.pending[path] = self.executor.submit(render_card, path, self.config, self.backend)
+    
+    @staticmethod
+    def _wrap_rendered(data: Optional[Tuple[bytes, bytes]]) -> Optional[Tuple[ImageReader, ImageReader]]:
+        if data is None:
             return None
+        from reportlab.lib.utils import ImageReader
+        bleed_data, card_data = data
+        return ImageReader(BytesIO(bleed_data)), ImageReader(BytesIO(card_data))
     
-    def draw_corner_guides(self, c: canvas.Canvas, x: float, y: float, w: float, h: float):
-        bevel = self.mm_to_pt(self.config.corner_bevel_mm) / 2
-        line_w = self.mm_to_pt(self.config.corner_line_width_mm)
-        offset = line_w / 2
+    def draw_card(self, c: canvas.Canvas, readers: Tuple[ImageReader, ImageReader],
+                  x: float, y: float, layout: dict, name: Optional[str] = None):
+        bleed_reader, card_reader = readers
+        bleed_pt = layout['bleed_pt']
+        
+        if name is None:
+            c.drawImage(bleed_reader, x, y, width=layout['placed_w'], height=layout['placed_h'])
+            c.drawImage(card_reader, x + bleed_pt, y + bleed_pt,
+                        width=layout['card_w'], height=layout['card_h'])
+            return
+        
+        # Named cards are embedded once as a form XObject and referenced on every later draw,
+        # instead of drawImage re-reading and re-hashing the image data each time
+        if not c.hasForm(name):
+            c.beginForm(name)
+            self.draw_card(c, readers, 0, 0, layout)
+            c.endForm()
+        
+        c.saveState()
+        c.translate(x, y)
+        c.doForm(name)
+        c.restoreState()
+    
+    def draw_corner_guides(self, c: canvas.Canvas, x: float, y: float, layout: dict):
+        w = layout['card_w']
+        h = layout['card_h']
+        bevel = layout['bevel_pt']
+        offset = layout['offset_pt']
+        
+        segments = [
+            (x, y - offset, x + bevel, y - offset),
+            (x - offset, y, x - offset, y + bevel),
+            (x + w - bevel, y - offset, x + w, y - offset),
+            (x + w + offset, y, x + w + offset, y + bevel),
+            (x, y + h + offset, x + bevel, y + h + offset),
+            (x - offset, y + h - bevel, x - offset, y + h),
+            (x + w - bevel, y + h + offset, x + w, y + h + offset),
+            (x + w + offset, y + h - bevel, x + w + offset, y + h),
+        ]
         
-        c.setLineWidth(line_w)
-        c.setDash([1, 1])
+        c.setLineWidth(layout['line_w_pt'])
         
+        # Cyan and yellow dashes share the same segments, offset by one dash so they alternate
         c.setStrokeColorRGB(0, 1, 1)
-        c.line(x, y - offset, x + bevel, y - offset)
-        c.line(x - offset, y, x - offset, y + bevel)
-        
-        c.setStrokeColorRGB(1, 1, 0)
-        c.setDash([1, 1], 1)
-        c.line(x, y - offset, x + bevel, y - offset)
-        c.line(x - offset, y, x - offset, y + bevel)
-        
         c.setDash([1, 1], 0)
-        c.setStrokeColorRGB(0, 1, 1)
-        c.line(x + w - bevel, y - offset, x + w, y - offset)
-        c.line(x + w + offset, y, x + w + offset, y + bevel)
+        c.lines(segments)
         
         c.setStrokeColorRGB(1, 1, 0)
         c.setDash([1, 1], 1)
-        c.line(x + w - bevel, y - offset, x + w, y - offset)
-        c.line(x + w + offset, y, x + w + offset, y + bevel)
-        
-        c.setDash([1, 1], 0)
-        c.setStrokeColorRGB(0, 1, 1)
-        c.line(x, y + h + offset, x + bevel, y + h + offset)
-        c.line(x - offset, y + h - bevel, x - offset, y + h)
-        
-        c.setStrokeColorRGB(1, 1, 0)
-        c.setDash([1, 1], 1)
-        c.line(x, y + h + offset, x + bevel, y + h + offset)
-        c.line(x - offset, y + h - bevel, x - offset, y + h)
-        
-        c.setDash([1, 1], 0)
-        c.setStrokeColorRGB(0, 1, 1)
-        c.line(x + w - bevel, y + h + offset, x + w, y + h + offset)
-        c.line(x + w + offset, y + h - bevel, x + w + offset, y + h)
-        
-        c.setStrokeColorRGB(1, 1, 0)
-        c.setDash([1, 1], 1)
-        c.line(x + w - bevel, y + h + offset, x + w, y + h + offset)
-        c.line(x + w + offset, y + h - bevel, x + w + offset, y + h)
+        c.lines(segments)
         
         c.setDash()
     
     def draw_separators(self, c: canvas.Canvas, layout: dict):
         c.setStrokeColorRGB(0, 1, 1)
-        c.setLineWidth(self.mm_to_pt(self.config.separator_width_mm))
+        c.setLineWidth(layout['sep_w_pt'])
         
-        spacing = self.mm_to_pt(self.config.spacing_mm)
-        placed_w = self.mm_to_pt(self.config.card_width_mm + 2 * self.config.bleed_mm)
-        placed_h = self.mm_to_pt(self.config.card_height_mm + 2 * self.config.bleed_mm)
+        spacing = layout['spacing']
+        placed_w = layout['placed_w']
+        placed_h = layout['placed_h']
         
-        for col in range(1, self.config.grid_cols):
-            x = layout['start_x'] + col * (placed_w + spacing)
-            c.line(x, 0, x, self.page_height)
-            
-        for row in range(1, self.config.grid_rows):
-            y = layout['start_y'] + row * (placed_h + spacing)
-            c.line(0, y, self.page_width, y)
+        xs = [layout['start_x'] + col * (placed_w + spacing) for col in range(1, self.config.grid_cols)]
+        ys = [layout['start_y'] + row * (placed_h + spacing) for row in range(1, self.config.grid_rows)]
+        
+        c.lines([(x, 0, x, self.page_height) for x in xs] +
+                [(0, y, self.page_width, y) for y in ys])
     
-    def draw_header(self, c: canvas.Canvas, timestamp: str, total_cards: int, page: int, pages: int):
+    def draw_header(self, c: canvas.Canvas, layout: dict, timestamp: str, total_cards: int, page: int, pages: int):
         c.setFillColorRGB(0, 0, 1)
         c.setFont("Helvetica", 7)
         
@@ -191,29 +273,47 @@ class CardPuncher:
                 f"DPI: {self.config.dpi} | Bleed: {self.config.bleed_mm}mm | "
                 f"Corner bevel: {self.config.corner_bevel_mm}mm")
         
-        x_offset = 10 + self.mm_to_pt(10)
-        y_offset = self.page_height - 6 - self.mm_to_pt(10)
-        c.drawString(x_offset, y_offset, info)
+        c.drawString(layout['header_x'], layout['header_y'], info)
     
     def calculate_layout(self) -> dict:
-        placed_w = self.mm_to_pt(self.config.card_width_mm + 2 * self.config.bleed_mm)
-        placed_h = self.mm_to_pt(self.config.card_height_mm + 2 * self.config.bleed_mm)
-        spacing = self.mm_to_pt(self.config.spacing_mm)
+        placed_w = (self.config.card_width_mm + 2 * self.config.bleed_mm) * PT_PER_MM
+        placed_h = (self.config.card_height_mm + 2 * self.config.bleed_mm) * PT_PER_MM
+        spacing = self.config.spacing_mm * PT_PER_MM
         
         grid_w = self.config.grid_cols * placed_w + (self.config.grid_cols - 1) * spacing
         grid_h = self.config.grid_rows * placed_h + (self.config.grid_rows - 1) * spacing
+        start_x = (self.page_width - grid_w) / 2
+        start_y = (self.page_height - grid_h) / 2
+        line_w = self.config.corner_line_width_mm * PT_PER_MM
+        
+        # Bottom-left corner of every grid slot in placement order; backs mirror the columns
+        cols, rows = self.config.grid_cols, self.config.grid_rows
+        xs = [start_x + col * (placed_w + spacing) for col in range(cols)]
+        ys = [start_y + (rows - 1 - row) * (placed_h + spacing) for row in range(rows)]
         
         return {
-            'start_x': (self.page_width - grid_w) / 2,
-            'start_y': (self.page_height - grid_h) / 2,
-            'card_w': self.mm_to_pt(self.config.card_width_mm),
-            'card_h': self.mm_to_pt(self.config.card_height_mm),
+            'start_x': start_x,
+            'start_y': start_y,
+            'card_w': self.config.card_width_mm * PT_PER_MM,
+            'card_h': self.config.card_height_mm * PT_PER_MM,
             'placed_w': placed_w,
             'placed_h': placed_h,
-            'spacing': spacing
+            'spacing': spacing,
+            'bleed_pt': self.config.bleed_mm * PT_PER_MM,
+            'bevel_pt': self.config.corner_bevel_mm * PT_PER_MM / 2,
+            'line_w_pt': line_w,
+            'offset_pt': line_w / 2,
+            'sep_w_pt': self.config.separator_width_mm * PT_PER_MM,
+            'header_x': 10 + 10 * PT_PER_MM,
+            'header_y': self.page_height - 6 - 10 * PT_PER_MM,
+            'front_slots': [(x, y) for y in ys for x in xs],
+            'back_slots': [(x, y) for y in ys for x in reversed(xs)],
         }
     
     def generate(self, input_folder: str, output_path: str):
+        from reportlab import rl_config
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
         images = self.find_images(input_folder)
         if not images:
             raise FileNotFoundError(f"No images found in {input_folder}")
@@ -224,60 +324,59 @@ class CardPuncher:
         has_cardback = os.path.exists(cardback_path)
         
         images = [img for img in images if 'cardback' not in img.lower()]
+        self.fronts = images
+        self.has_cardback = has_cardback
         
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         layout = self.calculate_layout()
-        c = canvas.Canvas(output_path, pagesize=A4)
+        # Card JPEGs go in as-is under DCTDecode; ReportLab's default would ASCII85-wrap each one
+        rl_config.useA85 = 0
+        c = canvas.Canvas(output_path, pagesize=A4, pageCompression=1)
         
         cards_per_page = self.config.grid_cols * self.config.grid_rows
         total_pages = (len(images) + cards_per_page - 1) // cards_per_page
-        bleed_pt = self.mm_to_pt(self.config.bleed_mm)
+        bleed_pt = layout['bleed_pt']
+        
+        # Workers render ahead while the main process draws; process_image waits on each card as it's placed
+        if self.executor:
+            lookahead = min(os.cpu_count() or 1, cards_per_page)
+            self.prerender(([cardback_path] + images) if has_cardback else images, lookahead)
+        cardback_result = self.process_image(cardback_path) if has_cardback else None
+        if has_cardback and not cardback_result:
+            self.failed.append(cardback_path)
         
         for page in range(total_pages):
-            self.draw_header(c, timestamp, len(images), page + 1, total_pages)
+            self.draw_header(c, layout, timestamp, len(images), page + 1, total_pages)
             
             page_images = images[page * cards_per_page:(page + 1) * cards_per_page]
             
-            for i, img_path in enumerate(page_images):
-                row, col = divmod(i, self.config.grid_cols)
-                x = layout['start_x'] + col * (layout['placed_w'] + layout['spacing'])
-                y = layout['start_y'] + (self.config.grid_rows - 1 - row) * (layout['placed_h'] + layout['spacing'])
-                
-                result = self.process_image(img_path)
+            for img_path, (x, y) in zip(page_images, layout['front_slots']):
+                # Fronts are placed exactly once, so their readers (and the RGB drawImage decodes onto
+                # them) are dropped after drawing. The embedded JPEG data itself stays in the
+                # document until c.save(), so memory still grows with the deck
+                result = self.process_image(img_path, cache=False)
                 if result:
-                    bleed_reader, card_reader = result
-                    
-                    c.drawImage(bleed_reader, x, y, width=layout['placed_w'], height=layout['placed_h'])
-                    c.drawImage(card_reader, x + bleed_pt, y + bleed_pt, 
-                              width=layout['card_w'], height=layout['card_h'])
+                    self.draw_card(c, result, x, y, layout)
                     
                     card_x = x + bleed_pt
                     card_y = y + bleed_pt
-                    self.draw_corner_guides(c, card_x, card_y, layout['card_w'], layout['card_h'])
+                    self.draw_corner_guides(c, card_x, card_y, layout)
+                else:
+                    self.failed.append(img_path)
             
             self.draw_separators(c, layout)
             
             if has_cardback:
                 c.showPage()
-                self.draw_header(c, timestamp, len(images), page + 1, total_pages)
+                self.draw_header(c, layout, timestamp, len(images), page + 1, total_pages)
                 
-                cardback_result = self.process_image(cardback_path)
                 if cardback_result:
-                    bleed_reader, card_reader = cardback_result
-                    
-                    for i in range(len(page_images)):
-                        row, col = divmod(i, self.config.grid_cols)
-                        mirrored_col = self.config.grid_cols - 1 - col
-                        x = layout['start_x'] + mirrored_col * (layout['placed_w'] + layout['spacing'])
-                        y = layout['start_y'] + (self.config.grid_rows - 1 - row) * (layout['placed_h'] + layout['spacing'])
-                        
-                        c.drawImage(bleed_reader, x, y, width=layout['placed_w'], height=layout['placed_h'])
-                        c.drawImage(card_reader, x + bleed_pt, y + bleed_pt, 
-                                  width=layout['card_w'], height=layout['card_h'])
+                    for x, y in layout['back_slots'][:len(page_images)]:
+                        self.draw_card(c, cardback_result, x, y, layout, name='cardback')
                         
                         card_x = x + bleed_pt
                         card_y = y + bleed_pt
-                        self.draw_corner_guides(c, card_x, card_y, layout['card_w'], layout['card_h'])
+                        self.draw_corner_guides(c, card_x, card_y, layout)
                 
                 self.draw_separators(c, layout)
             
@@ -288,6 +387,22 @@ class CardPuncher:
         return output_path
 
 
+def cache_key(folder: str, config: Config, backend: str) -> str:
+    with os.scandir(folder) as entries:
+        stats = ((e.name, e.stat()) for e in entries if e.is_file())
+        files = sorted((name, st.st_size, st.st_mtime_ns) for name, st in stats)
+    return hashlib.blake2b(repr((files, asdict(config), backend)).encode(), digest_size=16).hexdigest()
+
+
+def print_summary(config: Config, cards: int, has_cardback: bool):
+    print(f"Cards: {cards} | "
+          f"Size: {config.card_width_mm}x{config.card_height_mm}mm | "
+          f"Grid: {config.grid_cols}x{config.grid_rows} | "
+          f"DPI: {config.dpi}")
+    if has_cardback:
+        print(f"Double-sided: Yes (interleaved backs)")
+
+
 def main():
     parser = argparse.ArgumentParser(description='CardPuncher - Print-ready card layouts')
     parser.add_argument('folder', help='Folder containing card images')
@@ -295,16 +410,37 @@ def main():
     parser.add_argument('--dpi', type=int, help='Image resolution')
     parser.add_argument('--card-width-mm', type=float, help='Card width (mm)')
     parser.add_argument('--card-height-mm', type=float, help='Card height (mm)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help='Card render worker processes')
+    parser.add_argument('--backend', choices=['auto', 'pil', 'vips'], default='auto',
+                        help='Image backend for card decode/resize (vips needs pyvips)')
+    parser.add_argument('--force', action='store_true', help='Regenerate even if inputs are unchanged')
     
     args = parser.parse_args()
     
+    if not os.path.isdir(args.folder):
+        print(f"Error: Not a folder: {args.folder}")
+        sys.exit(1)
+    if args.jobs is not None and args.jobs < 1:
+        print("Error: --jobs must be at least 1")
+        sys.exit(1)
+    
+    check_dependencies()
+    
+    backend = args.backend
+    if backend == 'auto':
+        backend = 'vips' if vips_available() else 'pil'
+    elif backend == 'vips' and not vips_available():
+        print("Missing dependency: pyvips")
+        print("Install: pip install pyvips")
+        sys.exit(1)
+    
     config = Config.from_yaml(args.config)
     if args.dpi:
-        config.dpi = args.dpi
+        config = replace(config, dpi=args.dpi)
     if args.card_width_mm:
-        config.card_width_mm = args.card_width_mm
+        config = replace(config, card_width_mm=args.card_width_mm)
     if args.card_height_mm:
-        config.card_height_mm = args.card_height_mm
+        config = replace(config, card_height_mm=args.card_height_mm)
     
     script_dir = Path(__file__).parent
     output_dir = script_dir / 'output'
@@ -313,22 +449,27 @@ def main():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     folder_name = Path(args.folder).name
     output_path = output_dir / f"{folder_name}_{timestamp}.pdf"
+    key_path = output_dir / f"{folder_name}.cachekey"
     
     try:
-        puncher = CardPuncher(config)
-        puncher.generate(args.folder, str(output_path))
-        
-        fronts = [img for img in puncher.find_images(args.folder) if 'cardback' not in img.lower()]
-        cardback_path = os.path.join(args.folder, 'cardback.png')
-        has_back = os.path.exists(cardback_path) or os.path.exists(os.path.join(args.folder, 'CARDBACK.PNG'))
+        # Skip the whole render if the last PDF for this folder was built from identical inputs
+        key = cache_key(args.folder, config, backend)
+        if not args.force and key_path.exists():
+            cached_key, cached_name, cached_cards, cached_back = key_path.read_text().split('\n')
+            if cached_key == key and (output_dir / cached_name).exists():
+                print(f"\nSuccess (cached)! {output_dir / cached_name}")
+                print_summary(config, int(cached_cards), cached_back == '1')
+                return
+        
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            puncher = CardPuncher(config, executor=executor, backend=backend)
+            puncher.generate(args.folder, str(output_path))
+        # A card that failed to render is left out of the PDF; don't let a re-run reuse that
+        if not puncher.failed:
+            key_path.write_text(f"{key}\n{output_path.name}\n{len(puncher.fronts)}\n{int(puncher.has_cardback)}")
         
         print(f"\nSuccess! {output_path}")
-        print(f"Cards: {len(fronts)} | "
-              f"Size: {config.card_width_mm}x{config.card_height_mm}mm | "
-              f"Grid: {config.grid_cols}x{config.grid_rows} | "
-              f"DPI: {config.dpi}")
-        if has_back:
-            print(f"Double-sided: Yes (interleaved backs)")
+        print_summary(config, len(puncher.fronts), puncher.has_cardback)
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)